@@ -1,6 +1,12 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import Dict
 
+# Copy-on-write: frames share column buffers until a column is actually modified
+pd.set_option("mode.copy_on_write", True)
+
 
 def clean_all_tables(data_dict: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
     """
@@ -31,52 +37,59 @@ def clean_all_tables(data_dict: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFra
             continue
             
         print(f"Cleaning table: {name} ({df.shape[0]:,} rows)")
-        df = df.copy()
         
-        # Standardize columns
-        df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
+        # Standardize columns (rename returns a new frame, so the caller's frame is never touched)
+        df = df.rename(columns=lambda col: col.strip().lower().replace(" ", "_"))
         
         # Datetime conversion
         date_cols = ["created_at", "transaction_at", "referral_at", "updated_at", "membership_expired_date"]
         for col in date_cols:
             if col in df.columns:
+                # Arrow-typed columns aren't re-parsed; out-of-range values (e.g. 9999-12-31) coerce to NaT
                 df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
+                if isinstance(df[col].dtype, pd.ArrowDtype):
+                    # ns Arrow timestamps come back Arrow-backed; they always fit in datetime64[ns]
+                    df[col] = df[col].astype("datetime64[ns, UTC]")
                 if col == "membership_expired_date":
                     df[col] = df[col].dt.tz_localize(None)
         
         # Reward value fix
         if "reward_value" in df.columns:
-            df["reward_value"] = df["reward_value"].astype(str).str.extract(r"(\d+)").astype("float")
-            df["reward_value"] = df["reward_value"].astype("Int64")
+            df["reward_value"] = df["reward_value"].astype("string[pyarrow]") \
+                .str.extract(r"(?P<reward_value>\d+)", expand=False).astype("Int32")  # reward values fit in 31 bits
         
-        # Booleans
-        bool_map = {"True": True, "False": False, "true": True, "false": False}
-        if "is_deleted" in df.columns:
-            df["is_deleted"] = df["is_deleted"].map(bool_map).fillna(False).astype(bool)
-        if "is_reward_granted" in df.columns:
-            df["is_reward_granted"] = df["is_reward_granted"].astype(str).str.strip()
-            df["is_reward_granted"] = df["is_reward_granted"].map(bool_map).fillna(False).astype(bool)
+        # Booleans: flags arrive as text from data_loader; trim + lowercase with Arrow kernels, only "true" is True
+        for col in ["is_deleted", "is_reward_granted"]:
+            if col in df.columns:
+                if pd.api.types.is_bool_dtype(df[col]):
+                    df[col] = df[col].fillna(False).astype(bool)
+                else:
+                    values = pc.utf8_lower(pc.utf8_trim_whitespace(pa.array(df[col].astype("string[pyarrow]"))))
+                    df[col] = pc.equal(values, "true").fill_null(False).to_numpy(zero_copy_only=False)
         
         # Drop duplicates
         df = df.drop_duplicates()
         
         # NULL HANDLING (no aggressive drop for referrals)
+        # Row masks come from one NumPy reduction over the null matrix, then a single iloc take
         if name == 'user_referrals':
             # Only drop if critical keys are null (keep expected nulls like transaction_id/reward_id)
             critical = ['referral_id', 'referral_at', 'referral_source', 'user_referral_status_id']
-            before = len(df)
-            df = df.dropna(subset=[c for c in critical if c in df.columns])
-            print(f"   → Dropped {before - len(df):,} rows with missing critical keys only")
+            keep = df[[c for c in critical if c in df.columns]].notna().to_numpy().all(axis=1)
+            df = df.iloc[keep]
+            print(f"   → Dropped {len(keep) - keep.sum():,} rows with missing critical keys only")
         elif name in ['referral_rewards', 'paid_transactions', 'user_logs', 'user_referral_statuses']:
             # Stricter for these: drop any full null rows
-            before = len(df)
-            df = df.dropna(how='any')
-            print(f"   → Dropped {before - len(df):,} incomplete rows")
+            keep = ~df.isna().to_numpy().any(axis=1)
+            df = df.iloc[keep]
+            print(f"   → Dropped {len(keep) - keep.sum():,} incomplete rows")
         else:
             # Logs: keep most
-            df = df.dropna(subset=df.columns[:2], how='all')  # drop only if totally empty
+            keep = df.iloc[:, :2].notna().to_numpy().any(axis=1)  # drop only if totally empty
+            df = df.iloc[keep]
             
         cleaned[name] = df
-        print(f"   → Cleaned! Final shape: {df.shape} | Total nulls: {df.isnull().sum().sum()}")
+        total_nulls = int(np.count_nonzero(df.isna().to_numpy()))  # one reduction over the null matrix
+        print(f"   → Cleaned! Final shape: {df.shape} | Total nulls: {total_nulls}")
     
     return cleaned
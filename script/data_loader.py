@@ -1,7 +1,23 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 from typing import Dict, Optional
 
+# Flag columns are read as text so one padded or odd value can't fail the whole file;
+# data_cleaner turns them into booleans
+FLAG_COLUMNS = {"is_deleted": "string[pyarrow]", "is_reward_granted": "string[pyarrow]"}
+
+
+def _read_csv(file: Path) -> pd.DataFrame:
+    """Read one CSV with the Arrow parser into Arrow-backed dtypes (string[pyarrow], timestamp[pyarrow], ...)."""
+    df = pd.read_csv(file, engine="pyarrow", dtype_backend="pyarrow", dtype=FLAG_COLUMNS)
+    # Downcast integers to the narrowest type that holds them (ids and codes here fit in a few bits).
+    # Floats are left as float64: float32 would silently round values like 12345.67
+    for col in df.select_dtypes("integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
 
 def data_loader(source_path: str | Path) -> Optional[Dict[str, pd.DataFrame]]:
     """
@@ -31,14 +47,17 @@ def data_loader(source_path: str | Path) -> Optional[Dict[str, pd.DataFrame]]:
         return {}  # Return empty dict
     
     data_frames = {}
-    for file in csv_files:
-        try:
-            # Use stem (filename without extension) as key
-            df = pd.read_csv(file)
-            data_frames[file.stem] = df
-            print(f"Loaded {file.name} → {len(df):,} rows, {len(df.columns)} columns")
-        except Exception as e:
-            print(f"Failed to load {file.name}: {e}")
-            # Continue loading others instead of crashing
+    # Arrow parsing releases the GIL, so files are parsed concurrently on a thread pool
+    with ThreadPoolExecutor(max_workers=min(len(csv_files), os.cpu_count() or 1)) as executor:
+        futures = {file: executor.submit(_read_csv, file) for file in csv_files}
+        for file, future in futures.items():  # collect in sorted file order
+            try:
+                df = future.result()
+                # Use stem (filename without extension) as key
+                data_frames[file.stem] = df
+                print(f"Loaded {file.name} → {len(df):,} rows, {len(df.columns)} columns")
+            except Exception as e:
+                print(f"Failed to load {file.name}: {e}")
+                # Continue loading others instead of crashing
     
     return data_frames
@@ -1,5 +1,32 @@
 import pandas as pd
-from typing import Dict
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Any, Dict, Optional, Tuple
+
+
+def _top_value(series: pd.Series, arr: Optional[pa.Array]) -> Tuple[Any, int]:
+    """Most frequent non-null value and its count: Arrow kernels when they apply, pandas otherwise."""
+    if arr is not None:
+        try:
+            vc = pc.value_counts(pc.drop_null(arr))
+            counts = vc.field("counts")
+            top = pc.index(counts, pc.max(counts)).as_py()  # first value with the highest count
+            return vc.field("values")[top].as_py(), counts[top].as_py()
+        except pa.ArrowException:
+            pass
+    vc = series.value_counts(dropna=True)
+    return vc.index[0], vc.iat[0]
+
+
+def _min_max(series: pd.Series, arr: Optional[pa.Array]) -> Tuple[Any, Any]:
+    """Min and max in one Arrow pass when possible, pandas otherwise."""
+    if arr is not None:
+        try:
+            min_max = pc.min_max(arr)
+            return min_max["min"].as_py(), min_max["max"].as_py()
+        except pa.ArrowException:
+            pass
+    return series.min(), series.max()
 
 
 def profile_table(df: pd.DataFrame, table_name: str = "") -> pd.DataFrame:
@@ -19,14 +46,29 @@ def profile_table(df: pd.DataFrame, table_name: str = "") -> pd.DataFrame:
     profile_data = []
     total_rows = len(df)
     
-    for col in df.columns:
-        null_count = df[col].isnull().sum()
-        distinct_count = df[col].nunique(dropna=True)
+    for col, series in df.items():
+        dtype = series.dtype
+        is_num = pd.api.types.is_numeric_dtype(dtype)
+        # Arrow per column; any column Arrow can't type or aggregate (mixed objects, Period, Interval, ...)
+        # falls back to pandas on its own instead of failing the table
+        try:
+            arr = pa.array(series, from_pandas=True)
+            if pa.types.is_dictionary(arr.type):
+                arr = arr.dictionary_decode()  # pandas category
+            null_count = arr.null_count  # read from the validity bitmap
+            distinct_count = pc.count_distinct(arr).as_py()
+        except pa.ArrowException:
+            arr = None
+            null_count = int(series.isnull().sum())
+            try:
+                distinct_count = series.nunique(dropna=True)
+            except TypeError:  # unhashable values (e.g. lists): count their string form
+                distinct_count = series.dropna().astype(str).nunique()
         
         row = {
             "table_name": table_name or "unknown",
             "column_name": col,
-            "data_type": str(df[col].dtype),
+            "data_type": str(dtype),
             "row_count": total_rows,
             "null_count": null_count,
             "null_%": round(null_count / total_rows * 100, 4) if total_rows else 0,
@@ -36,19 +78,20 @@ def profile_table(df: pd.DataFrame, table_name: str = "") -> pd.DataFrame:
         
         # Top value (only if not too many unique values)
         if distinct_count > 0 and distinct_count < total_rows:
-            try:
-                top_val = df[col].value_counts(dropna=True).index[0]
-                top_freq = df[col].value_counts(dropna=True).iloc[0]
-                row["top_value"] = top_val
-                row["top_value_freq"] = top_freq
-            except Exception:
+            if distinct_count / total_rows > 0.5:
+                # Mostly-unique column: no meaningful "top", skip the value count
                 row["top_value"] = None
                 row["top_value_freq"] = 0
+            else:
+                try:
+                    row["top_value"], row["top_value_freq"] = _top_value(series, arr)
+                except Exception:
+                    row["top_value"] = None
+                    row["top_value_freq"] = 0
         
-        # Min/Max for numeric columns
-        if pd.api.types.is_numeric_dtype(df[col]):
-            row["min_value"] = df[col].min()
-            row["max_value"] = df[col].max()
+        # Min/Max for numeric columns (single pass)
+        if is_num:
+            row["min_value"], row["max_value"] = _min_max(series, arr)
         
         profile_data.append(row)
     
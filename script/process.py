@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def process_and_validate_referrals(cleaned_data: dict) -> pd.DataFrame:
@@ -31,15 +32,17 @@ def process_and_validate_referrals(cleaned_data: dict) -> pd.DataFrame:
 
     print(f"Starting with {len(referrals)} referrals")
 
-    # Convert key types for consistent merging
-    if 'referral_reward_id' in referrals.columns:
-        referrals['referral_reward_id'] = referrals['referral_reward_id'].astype(str)
-    if not rewards.empty:
-        rewards['id'] = rewards['id'].astype(str)
-    if 'user_referral_status_id' in referrals.columns:
-        referrals['user_referral_status_id'] = referrals['user_referral_status_id'].astype(str)
-    if not statuses.empty:
-        statuses['id'] = statuses['id'].astype(str)
+    # Encode join keys as categoricals over one shared category set, so the merges hash integer codes
+    def shared_categorical(left, right):
+        categories = pd.Index(pd.concat([left, right], ignore_index=True).dropna().unique())
+        return pd.Categorical(left, categories=categories), pd.Categorical(right, categories=categories)
+
+    if 'referral_reward_id' in referrals.columns and not rewards.empty:
+        referrals['referral_reward_id'], reward_ids = shared_categorical(referrals['referral_reward_id'], rewards['id'])
+        rewards = rewards.assign(id=reward_ids)
+    if 'user_referral_status_id' in referrals.columns and not statuses.empty:
+        referrals['user_referral_status_id'], status_ids = shared_categorical(referrals['user_referral_status_id'], statuses['id'])
+        statuses = statuses.assign(id=status_ids)
 
     # 1. Status join
     if not statuses.empty:
@@ -60,72 +63,74 @@ def process_and_validate_referrals(cleaned_data: dict) -> pd.DataFrame:
 
     # 4. Referrer info
     if not users.empty:
-        referrer_df = users[['user_id', 'membership_expired_date', 'is_deleted', 'timezone_homeclub']] \
-            .drop_duplicates() \
+        # user_id is the key: dedup on it alone (last record wins) so the join is many-to-one
+        referrer_df = users.drop_duplicates(subset='user_id', keep='last') \
+            [['user_id', 'membership_expired_date', 'is_deleted', 'timezone_homeclub']] \
             .rename(columns={
                 'user_id': 'referrer_id',
                 'membership_expired_date': 'referrer_membership_expired',
                 'is_deleted': 'referrer_is_deleted',
                 'timezone_homeclub': 'referrer_timezone'
             })
-        referrals = referrals.merge(referrer_df, on='referrer_id', how='left')
+        referrals = referrals.merge(referrer_df, on='referrer_id', how='left', validate='m:1')
     # Handle NaN in referrer fields conservatively
     referrals['referrer_is_deleted'] = referrals['referrer_is_deleted'].fillna(True).astype(bool)  # Assume deleted if unknown (strict)
     referrals['referrer_membership_expired'] = pd.to_datetime(referrals['referrer_membership_expired'], errors='coerce').fillna(pd.Timestamp('1900-01-01'))  # Assume expired if unknown
 
-    # 5. source_transaction_id from logs
-    if not referral_logs.empty:
-        logs_src = referral_logs[['user_referral_id', 'source_transaction_id']].drop_duplicates()
-        referrals = referrals.merge(logs_src, left_on='referral_id', right_on='user_referral_id', how='left')
-        referrals.drop(columns=['user_referral_id'], errors='ignore', inplace=True)
-
-    # 6. Reward granted
+    # 5-6. source_transaction_id and reward granted from logs (one aggregation, one join)
     if not referral_logs.empty:
         print("Granted counts:", referral_logs['is_reward_granted'].value_counts())
-        granted = referral_logs[referral_logs['is_reward_granted'] == True][['user_referral_id']].drop_duplicates()
-        granted['referee_reward_granted'] = True
-        referrals = referrals.merge(granted, left_on='referral_id', right_on='user_referral_id', how='left')
+        logs_agg = referral_logs.groupby('user_referral_id', as_index=False, sort=False).agg(
+            source_transaction_id=('source_transaction_id', 'first'),
+            referee_reward_granted=('is_reward_granted', 'max')
+        )
+        referrals = referrals.merge(logs_agg, left_on='referral_id', right_on='user_referral_id', how='left')
         referrals.drop(columns=['user_referral_id'], errors='ignore', inplace=True)
         referrals['referee_reward_granted'] = referrals['referee_reward_granted'].fillna(False).astype(bool)
 
     # 7. Timezone selection (priority: transaction > lead > referrer > default)
-    def get_timezone(row):
-        if pd.notna(row.get('timezone_transaction')):
-            return row['timezone_transaction']
-        if row['referral_source'] == 'Lead' and pd.notna(row.get('source_transaction_id')) and not leads.empty:
-            lead_row = leads[leads['lead_id'] == row['source_transaction_id']]
-            if not lead_row.empty:
-                return lead_row['timezone_location'].iloc[0]
-        if pd.notna(row.get('referrer_timezone')):
-            return row['referrer_timezone']
-        return 'Asia/Jakarta'  # safe default
-
-    referrals['effective_timezone'] = referrals.apply(get_timezone, axis=1)
-
-    # Ensure timestamps are timezone-aware UTC first
-    referrals['referral_at'] = pd.to_datetime(referrals['referral_at'], utc=True, errors='coerce')
-    referrals['transaction_at'] = pd.to_datetime(referrals['transaction_at'], utc=True, errors='coerce')
-
-    # Convert to local time safely AND MAKE NAIVE
+    # Hashed lead lookup shared by timezone and source category (first match per lead_id)
+    is_lead = referrals['referral_source'].eq('Lead')
+    if not leads.empty and 'source_transaction_id' in referrals.columns:
+        lead_lookup = leads.dropna(subset=['lead_id']).drop_duplicates(subset='lead_id').set_index('lead_id')
+        lead_timezone = referrals['source_transaction_id'].map(lead_lookup['timezone_location']).where(is_lead)
+        lead_category = referrals['source_transaction_id'].map(lead_lookup['source_category']).where(is_lead)
+    else:
+        lead_timezone = pd.Series(None, index=referrals.index, dtype=object)
+        lead_category = pd.Series(None, index=referrals.index, dtype=object)
+
+    referrals['effective_timezone'] = referrals['timezone_transaction'] \
+        .fillna(lead_timezone) \
+        .fillna(referrals['referrer_timezone']) \
+        .fillna('Asia/Jakarta')  # safe default
+
+    # Ensure timestamps are timezone-aware UTC first (the cleaner already produces them; only parse otherwise)
+    def ensure_utc(ts):
+        if getattr(ts.dtype, 'tz', None) is not None:
+            return ts.dt.tz_convert('UTC')  # metadata-only change, no re-parse
+        return pd.to_datetime(ts, utc=True, errors='coerce')
+
+    referrals['referral_at'] = ensure_utc(referrals['referral_at'])
+    referrals['transaction_at'] = ensure_utc(referrals['transaction_at'])
+
+    # Convert to local time safely AND MAKE NAIVE (one tz_convert per distinct timezone)
     def convert_to_local(ts, tz):
-        if pd.isna(ts) or pd.isna(tz):
-            return pd.NaT
-        try:
-            return ts.tz_convert(tz).tz_localize(None)  # Convert and remove tz to make naive
-        except Exception:
-            return pd.NaT
-
-    referrals['local_referral_at'] = referrals.apply(
-        lambda row: convert_to_local(row['referral_at'], row['effective_timezone']), axis=1
-    )
+        parts = []
+        for zone, group in ts.groupby(tz, sort=False):
+            try:
+                parts.append(group.dt.tz_convert(zone).dt.tz_localize(None))  # Convert and remove tz to make naive
+            except Exception:
+                parts.append(pd.Series(pd.NaT, index=group.index, dtype='datetime64[ns]'))
+        if not parts:
+            return pd.Series(pd.NaT, index=ts.index, dtype='datetime64[ns]')
+        return pd.concat(parts).reindex(ts.index)  # rows with a missing timezone become NaT
+
+    referrals['local_referral_at'] = convert_to_local(referrals['referral_at'], referrals['effective_timezone'])
 
-    referrals['local_transaction_at'] = referrals['transaction_at'].dt.tz_localize(None)  # Start naive
     mask_tx = referrals['timezone_transaction'].notna()
-    if mask_tx.any():
-        converted = referrals.loc[mask_tx].apply(
-            lambda row: convert_to_local(row['transaction_at'], row['timezone_transaction']), axis=1
-        )
-        referrals.loc[mask_tx, 'local_transaction_at'] = converted
+    referrals['local_transaction_at'] = convert_to_local(
+        referrals['transaction_at'], referrals['timezone_transaction']
+    ).where(mask_tx, referrals['transaction_at'].dt.tz_localize(None))  # naive UTC when no transaction tz
 
     # Enforce dtype (in case of all NaT or issues)
     referrals['local_referral_at'] = pd.to_datetime(referrals['local_referral_at'], errors='coerce')
@@ -134,69 +139,78 @@ def process_and_validate_referrals(cleaned_data: dict) -> pd.DataFrame:
     # 8. String initcap
     for col in ['referee_name', 'referee_phone']:
         if col in referrals.columns:
-            referrals[col] = referrals[col].astype(str).str.title()
+            referrals[col] = referrals[col].astype("string[pyarrow]").str.title()  # Arrow utf8_title kernel
 
     # 9. referral_source_category
-    def get_source_category(row):
-        source = row['referral_source']
-        if source == 'User Sign Up':
-            return 'Online'
-        if source == 'Draft Transaction':
-            return 'Offline'
-        if source == 'Lead' and pd.notna(row.get('source_transaction_id')) and not leads.empty:
-            lead = leads[leads['lead_id'] == row['source_transaction_id']]
-            if not lead.empty:
-                return lead['source_category'].iloc[0]
-        return None
-
-    referrals['referral_source_category'] = referrals.apply(get_source_category, axis=1)
-
-    # 10. Business Logic - safe month extraction
-    mask_ref = pd.notna(referrals['local_referral_at'])
-    referrals.loc[mask_ref, 'referral_month'] = referrals.loc[mask_ref, 'local_referral_at'].dt.to_period('M')
-    
-    mask_tx_month = pd.notna(referrals['local_transaction_at'])
-    referrals.loc[mask_tx_month, 'transaction_month'] = referrals.loc[mask_tx_month, 'local_transaction_at'].dt.to_period('M')
+    source = referrals['referral_source']
+    referrals['referral_source_category'] = np.select(
+        [source.eq('User Sign Up'), source.eq('Draft Transaction'), is_lead],
+        ['Online', 'Offline', lead_category.to_numpy(dtype=object)],
+        default=None
+    )
 
+    # 10. Business Logic
     current_date = pd.Timestamp('2025-12-09')
 
     # Reward handling (NaN/0 as invalid)
     referrals['reward_value'] = referrals['reward_value'].fillna(0)
-    reward_valid = referrals['reward_value'] > 0
+
+    # Bind every rule input to a raw NumPy array once; missing strings become NaN so they never match
+    def as_object(col):
+        return referrals[col].to_numpy(dtype=object, na_value=np.nan)
+
+    rv = referrals['reward_value'].to_numpy()
+    status = as_object('referral_status')
+    tx_id = as_object('transaction_id')
+    tx_status = as_object('transaction_status')
+    tx_type = as_object('transaction_type')
+    local_ref = referrals['local_referral_at'].to_numpy()
+    local_tx = referrals['local_transaction_at'].to_numpy()
+    expired = referrals['referrer_membership_expired'].to_numpy()
+    is_deleted = referrals['referrer_is_deleted'].to_numpy(dtype=bool)
+    granted = referrals['referee_reward_granted'].to_numpy(dtype=bool)
+
+    reward_valid = rv > 0
     reward_invalid = ~reward_valid
+    is_success = status == 'Berhasil'
+    has_tx = pd.notna(tx_id)
+    is_paid = tx_status == 'PAID'
+    tx_after_ref = local_tx > local_ref  # NaT compares False
+    # Same calendar month as integer months since epoch (NaT rows never match)
+    same_month = (
+        (local_ref.astype('datetime64[M]').astype('int64') == local_tx.astype('datetime64[M]').astype('int64')) &
+        ~np.isnat(local_ref) & ~np.isnat(local_tx)
+    )
 
     valid_success = (
         reward_valid &
-        (referrals['referral_status'] == 'Berhasil') &
-        referrals['transaction_id'].notna() &
-        (referrals['transaction_status'] == 'PAID') &
-        (referrals['transaction_type'] == 'NEW') &
-        (referrals['local_transaction_at'] > referrals['local_referral_at']) &
-        (referrals['referral_month'] == referrals['transaction_month']) &
-        (referrals['referrer_membership_expired'] >= current_date) &
-        (~referrals['referrer_is_deleted']) &
-        referrals['referee_reward_granted']
+        is_success &
+        has_tx &
+        is_paid &
+        (tx_type == 'NEW') &
+        tx_after_ref &
+        same_month &
+        (expired >= np.datetime64(current_date)) &
+        ~is_deleted &
+        granted
     )
 
     valid_pending_failed = (
-        referrals['referral_status'].isin(['Menunggu', 'Tidak Berhasil']) &
+        ((status == 'Menunggu') | (status == 'Tidak Berhasil')) &
         reward_invalid
     )
 
     conditions_valid = valid_success | valid_pending_failed
 
     conditions_invalid = (
-        (reward_valid & (referrals['referral_status'] != 'Berhasil')) |
-        (reward_valid & referrals['transaction_id'].isna()) |
-        (reward_invalid & referrals['transaction_id'].notna() &
-         (referrals['transaction_status'] == 'PAID') &
-         (referrals['local_transaction_at'] > referrals['local_referral_at'])) |
-        ((referrals['referral_status'] == 'Berhasil') & reward_invalid) |
-        (referrals['local_transaction_at'] < referrals['local_referral_at'])
+        (reward_valid & ~is_success) |
+        (reward_valid & ~has_tx) |
+        (reward_invalid & has_tx & is_paid & tx_after_ref) |
+        (is_success & reward_invalid) |
+        (local_tx < local_ref)
     )
 
     referrals['is_business_logic_valid'] = conditions_valid & ~conditions_invalid
-    referrals['is_business_logic_valid'] = referrals['is_business_logic_valid'].fillna(False)
 
     # Final report
     final_cols = [
@@ -1,6 +1,7 @@
 from rich.table import Table
 from rich.console import Console
 from rich import box
+import numpy as np
 import pandas as pd
 
 console = Console()
@@ -35,18 +36,22 @@ def print_pretty_data(data_dict: dict):
             table.add_column(str(col), overflow="fold", max_width=25)
 
         # Add rows (limit to first 30 rows for readability)
-        preview_rows = df.head(30).itertuples(index=False, name=None)
-        for row in preview_rows:
-            # Convert NaN → "—", format dates nicely if possible
-            formatted_row = []
-            for val in row:
-                if pd.isna(val):
-                    formatted_row.append("[dim]—[/]")
-                elif isinstance(val, (pd.Timestamp, pd.DatetimeIndex)):
-                    formatted_row.append(f"[cyan]{val}[/]")
-                else:
-                    formatted_row.append(str(val))
-            table.add_row(*formatted_row)
+        # Format column by column: NaN → "—", dates in cyan; then zip the columns into rows
+        preview = df.head(30)
+        formatted_cols = []
+        for col in preview.columns:
+            values = preview[col]
+            present = values.notna().to_numpy()
+            values = values[present]  # format non-null values only so nullable ints keep their int repr
+            if values.dtype.kind == "M":
+                text = ("[cyan]" + values.map(str) + "[/]").to_numpy(dtype=object)
+            else:
+                text = values.astype(str).to_numpy(dtype=object)
+            formatted = np.full(len(present), "[dim]—[/]", dtype=object)
+            formatted[present] = text
+            formatted_cols.append(formatted.tolist())
+        for row in zip(*formatted_cols):
+            table.add_row(*row)
 
         # Show if more rows exist
         if len(df) > 30:
@@ -35,24 +35,24 @@ def print_pretty_profile(profiles_dict: dict):
         table.add_column("Distinct %", justify="right", width=12)
         table.add_column("Top Value → Count", justify="left")
 
-        for _, row in profile_df.iterrows():
-            null_p = f"{row['null_%']:.4f}%".rstrip('0').rstrip('.') + "%"
-            dist_p = f"{row['distinct_%']:.4f}%".rstrip('0').rstrip('.') + "%"
-
-            top_val = row.get("top_value")
-            top_freq = row.get("top_value_freq")
-            if pd.notna(top_val) and pd.notna(top_freq):
-                top_str = f"[yellow]{top_val}[/] → [bold]{int(top_freq):,}[/]"
-            else:
-                top_str = "—"
-
-            table.add_row(
-                row["column_name"],
-                str(row["data_type"]),
-                null_p,
-                dist_p,
-                top_str
-            )
+        # Build each display column in one pass, then zip into rows (no per-row Series from iterrows)
+        def as_percent(col):
+            return (profile_df[col].map("{:.4f}".format).str.rstrip('0').str.rstrip('.') + "%").tolist()
+
+        missing = pd.Series(None, index=profile_df.index, dtype=object)
+        top_strs = [
+            f"[yellow]{top_val}[/] → [bold]{int(top_freq):,}[/]" if pd.notna(top_val) and pd.notna(top_freq) else "—"
+            for top_val, top_freq in zip(profile_df.get("top_value", missing), profile_df.get("top_value_freq", missing))
+        ]
+
+        for row in zip(
+            profile_df["column_name"].astype(str).tolist(),
+            profile_df["data_type"].astype(str).tolist(),
+            as_percent("null_%"),
+            as_percent("distinct_%"),
+            top_strs
+        ):
+            table.add_row(*row)
 
         console.print(table)
         console.print()  # blank line between tables
\ No newline at end of file